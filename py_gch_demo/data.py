@@ -1,6 +1,5 @@
 __doc__ = "Utilities for data set generation."
 
-from functools import partial
 import numpy as np
 
 
@@ -25,7 +24,8 @@ def make_linear_regression(
     :type n_features: int, optional
     :param feature_cov: Optional covariance matrix for the input features. If
         not provided, the identity matrix will be used. If a float is provided,
-        then ``feature_cov`` times the identity matrix will be used.
+        then ``feature_cov`` times the identity matrix will be used. Must be
+        symmetric positive definite.
     :type feature_cov: float or :class:`numpy.ndarray`, optional
     :param output_mean: Mean of the regression output. Since inputs are
         centered, it is identical to the true bias/intercept coefficient term
@@ -39,9 +39,7 @@ def make_linear_regression(
     :rtype: tuple
     """
     # set defaults
-    if feature_cov is None:
-        feature_cov = np.eye(n_features)
-    elif isinstance(feature_cov, (int, float)):
+    if isinstance(feature_cov, (int, float)):
         feature_cov = feature_cov * np.eye(n_features)
     if rng is None:
         rng = np.random.default_rng()
@@ -49,18 +47,33 @@ def make_linear_regression(
         rng = np.random.default_rng(rng)
     # get "true" parameters
     weights = rng.random(size = n_features)
-    # callable to generate input examples. we pass check_valid = "raise" so
-    # that an exception is raised if feature_cov is not positive semidefinite
-    make_inputs = partial(
-        rng.multivariate_normal, np.zeros(n_features), feature_cov,
-        check_valid = "raise"
-    )
-    # callable to generate additive noise for outputs
-    output_noise = partial(rng.normal, scale = output_std)
-    # make train and test data + return
-    X_train, X_test = make_inputs(size = n_train), make_inputs(size = n_test)
-    y_train = X_train @ weights + output_mean + output_noise(size = n_train)
-    y_test = X_test @ weights + output_mean + output_noise(size = n_test)
+    # Cholesky factor of feature_cov. we factor once up front, which also
+    # checks that feature_cov is positive definite. only the lower triangle is
+    # read by the factorization, so symmetry has to be checked separately
+    if feature_cov is not None:
+        feature_cov = np.asarray(feature_cov)
+        if not np.allclose(feature_cov, feature_cov.T):
+            raise ValueError("feature_cov must be symmetric")
+        try:
+            feature_chol = np.linalg.cholesky(feature_cov)
+        except np.linalg.LinAlgError as e:
+            raise ValueError("feature_cov must be positive definite") from e
+    # draw standard normals for train and test inputs and output noise in a
+    # single call. the first n_samples * n_features values are the inputs and
+    # the last n_samples values are the noise, both contiguous
+    n_samples = n_train + n_test
+    draws = rng.standard_normal(n_samples * (n_features + 1))
+    X = draws[:n_samples * n_features].reshape(n_samples, n_features)
+    noise = draws[n_samples * n_features:]
+    # identity covariance needs no further work, else transform with factor
+    if feature_cov is not None:
+        X = X @ feature_chol.T
+    # compute outputs with additive Gaussian noise, again for both splits
+    noise *= output_std
+    y = X @ weights + output_mean + noise
+    # split into train and test data + return
+    X_train, X_test = X[:n_train], X[n_train:]
+    y_train, y_test = y[:n_train], y[n_train:]
     return X_train, X_test, y_train, y_test
 
 
@@ -103,24 +116,27 @@ def make_linear_binary_classification(
     :type label_type: str, optional
     :param rng: Int seed for the new ``numpy`` RNG or an existing instance
     :type rng: int or :class:`numpy.random._generator.Generator`, optional
-    :returns: 4-tuple of ``X_train, X_test, y_train, y_test`` data
+    :returns: 4-tuple of ``X_train, X_test, y_train, y_test`` data. The labels
+        ``y_train``, ``y_test`` have dtype ``numpy.int8``.
     :rtype: tuple
     """
-    # check and set labels
+    # check and set labels. int8 is enough for binary labels and cuts memory
+    # traffic when labels are broadcast against float outputs downstream
     if label_type != "0-1" and label_type != "+/-1":
         raise ValueError("label_type must be either \"0-1\" or \"+/-1\"")
     if label_type == "0-1":
-        labels = np.array([0, 1])
+        labels = np.array([0, 1], dtype = np.int8)
     elif label_type == "+/-1":
-        labels = np.array([-1, 1])
+        labels = np.array([-1, 1], dtype = np.int8)
     # get linear regression problem from make_linear_regression
     X_train, X_test, y_train, y_test = make_linear_regression(
         n_train = n_train, n_test = n_test, n_features = n_features,
         feature_cov = feature_cov, output_mean = output_mean,
         output_std = output_std, rng = rng
     )
-    # replace y_train, y_test with labels
-    y_train = np.where(y_train < output_mean, labels[0], labels[1])
-    y_test = np.where(y_test < output_mean, labels[0], labels[1])
+    # replace y_train, y_test with labels by using the boolean threshold mask
+    # as an index into the 2-element labels array
+    y_train = labels[(y_train >= output_mean).astype(np.intp)]
+    y_test = labels[(y_test >= output_mean).astype(np.intp)]
     # done, return new data
     return X_train, X_test, y_train, y_test
\ No newline at end of file
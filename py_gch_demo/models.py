@@ -3,6 +3,139 @@ __doc__ = "Models for the Adam optimizer to try and optimize."
 from functools import partial
 import numpy as np
 
+# numba is optional. if unavailable, the NumPy implementations are used
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _svc_obj_numpy(wb, X, y, reg_lambda, buf):
+    """NumPy implementation of the :class:`PrimalLinearSVC` objective.
+
+    See :meth:`PrimalLinearSVC._obj_func` for parameter descriptions.
+
+    :param buf: Buffer for the hinge losses, shape ``(n_samples,)``
+    :type buf: :class:`numpy.ndarray`
+    :rtype: float
+    """
+    w, b = wb[:-1], wb[-1]
+    # hinge losses, computed in place in buf so that only the cast of w is
+    # allocated. w is cast so float32 X is not upcast to float64 by the matmul
+    np.matmul(
+        X, w.astype(np.promote_types(X.dtype, np.float32), copy = False),
+        out = buf
+    )
+    buf += b
+    buf *= y
+    np.subtract(1, buf, out = buf)
+    np.maximum(buf, 0, out = buf)
+    # hinge losses are summed in float64 even if buf is float32, since a
+    # float32 ulp of the total can exceed the optimizer's default tol
+    return buf.sum(dtype = np.float64) + reg_lambda * (w @ w)
+
+
+def _svc_grad_numpy(wb, yX, y, idx, reg_lambda, out):
+    """NumPy implementation of the :class:`PrimalLinearSVC` gradient.
+
+    See :meth:`PrimalLinearSVC._obj_grad` for parameter descriptions.
+
+    :param yX: Input matrix with rows scaled by their labels, i.e.
+        ``y[:, None] * X``, shape ``(n_samples, n_features)``
+    :type yX: :class:`numpy.ndarray`
+    :param idx: Indices of the minibatch examples, shape ``(batch_size,)``
+    :type idx: :class:`numpy.ndarray`
+    :param out: Output buffer to write the gradient to, shape
+        ``(n_features + 1,)``
+    :type out: :class:`numpy.ndarray`
+    :returns: ``out``
+    :rtype: :class:`numpy.ndarray`
+    """
+    # get yX, y minibatches and w, b
+    yX_batch, y_batch, w, b = yX[idx], y[idx], wb[:-1], wb[-1]
+    # minibatch margins y * (X @ w + b) = yX @ w + y * b, computed in place in
+    # the buffer from yX_batch @ w. w is cast so float32 yX_batch is not
+    # upcast to float64 by the matmul
+    margins = yX_batch @ w.astype(
+        np.promote_types(yX_batch.dtype, np.float32), copy = False
+    )
+    margins += b * y_batch
+    # 0/1 mask of the examples that contribute to the gradient
+    mask = (margins < 1).astype(margins.dtype)
+    # write w gradient (single gemv) and b derivative directly into out. the
+    # gemv writes into the w view of out, so no temporary is allocated
+    grad_w = out[:-1]
+    np.matmul(yX_batch.T, mask, out = grad_w)
+    np.negative(grad_w, out = grad_w)
+    grad_w += 2 * reg_lambda * w
+    out[-1] = -(mask @ y_batch)
+    return out
+
+
+def _svc_obj_loop(wb, X, y, reg_lambda, buf):
+    """Loop implementation of the :class:`PrimalLinearSVC` objective.
+
+    Intended to be compiled with ``numba``. Same signature as
+    :func:`_svc_obj_numpy`, but ``buf`` is unused since the hinge losses are
+    accumulated without being stored.
+
+    :rtype: float
+    """
+    n_features = wb.size - 1
+    b = wb[n_features]
+    # sum of hinge losses, one pass over X
+    loss = 0.
+    for i in range(y.size):
+        s = b
+        for j in range(n_features):
+            s += X[i, j] * wb[j]
+        margin = 1 - y[i] * s
+        if margin > 0:
+            loss += margin
+    # squared l2 norm of the weights
+    w_norm2 = 0.
+    for j in range(n_features):
+        w_norm2 += wb[j] * wb[j]
+    return loss + reg_lambda * w_norm2
+
+
+def _svc_grad_loop(wb, yX, y, idx, reg_lambda, out):
+    """Loop implementation of the :class:`PrimalLinearSVC` gradient.
+
+    Intended to be compiled with ``numba``. Same signature as
+    :func:`_svc_grad_numpy`.
+
+    :returns: ``out``
+    :rtype: :class:`numpy.ndarray`
+    """
+    n_features = wb.size - 1
+    b = wb[n_features]
+    # start from the penalty gradient (bias is not penalized)
+    for j in range(n_features):
+        out[j] = 2 * reg_lambda * wb[j]
+    out[n_features] = 0.
+    # accumulate contributions of minibatch examples with margin < 1
+    for i in range(idx.size):
+        k = idx[i]
+        s = y[k] * b
+        for j in range(n_features):
+            s += yX[k, j] * wb[j]
+        if s < 1:
+            for j in range(n_features):
+                out[j] -= yX[k, j]
+            out[n_features] -= y[k]
+    return out
+
+
+# objective and gradient implementations used by PrimalLinearSVC
+if njit is None:
+    _svc_obj_numba = _svc_grad_numba = None
+    _svc_obj, _svc_grad = _svc_obj_numpy, _svc_grad_numpy
+else:
+    _svc_obj_numba = njit(cache = True, fastmath = True)(_svc_obj_loop)
+    _svc_grad_numba = njit(cache = True, fastmath = True)(_svc_grad_loop)
+    _svc_obj, _svc_grad = _svc_obj_numba, _svc_grad_numba
+
 
 class PrimalLinearSVC:
     r"""Simple linear support vector machine class. Primal formulation only.
@@ -15,7 +148,8 @@ class PrimalLinearSVC:
        Only supports binary classification tasks.
 
     Initial parameter vector is drawn from a multivariate Gaussian with zero
-    mean and identity covariance.
+    mean and identity covariance. If ``numba`` is installed, the objective and
+    gradient are computed with JIT-compiled kernels.
 
     :param reg_lambda: Coefficient scaling the squared :math:`\ell_2`-norm of
         the weight vector in the objective. Increase for more regularization/
@@ -26,8 +160,15 @@ class PrimalLinearSVC:
         ``batch_size * n_samples``.
     :type batch_size: float or int, optional
     :param seed: Seed for the RNGs used by the objective and gradient functions
-        when performing stochastic gradient descent.
-    :type seed: int, optional
+        when performing stochastic gradient descent. A
+        :class:`numpy.random.SeedSequence`, e.g. one of the children returned
+        by :meth:`~numpy.random.SeedSequence.spawn`, or an existing bit
+        generator or generator may also be passed, which is useful for giving
+        models fit in parallel independent RNG streams. A passed generator is
+        used directly, i.e. its state is shared with the caller.
+    :type seed: int, :class:`numpy.random.SeedSequence`,
+        :class:`numpy.random.BitGenerator`, or
+        :class:`numpy.random.Generator`, optional
     """
     def __init__(
         self, reg_lambda = 1, batch_size = 0.2, max_iter = 200,
@@ -35,33 +176,49 @@ class PrimalLinearSVC:
         beta_2 = 0.999, eps = 1e-8, disable_gc = False, seed = None
     ):
         # check and set new parameters that aren't checked by optimizer
-        if isinstance(reg_lambda, (int, float)):
+        if isinstance(reg_lambda, (int, float, np.integer, np.floating)):
             if reg_lambda < 0:
                 raise ValueError("reg_lambda must be nonnegative")
         else:
             raise TypeError("reg_lambda must be int or float")
         self.reg_lambda = reg_lambda
-        if isinstance(batch_size, float):
+        if isinstance(batch_size, (float, np.floating)):
             if batch_size <= 0 or batch_size >= 1:
                 raise ValueError("float batch_size must be in (0, 1)")
-        elif isinstance(batch_size, int):
+        elif isinstance(batch_size, (int, np.integer)):
             if batch_size < 1:
                 raise ValueError("int batch_size must be positive")
         else:
             raise TypeError("batch_size must be int or float")
         self.batch_size = batch_size
-        # if seed is None, draw a random number to seed the RNG with
+        # if seed is None, draw a random (positive) number to seed the RNG with
         if seed is None:
             rng = np.random.default_rng()
-            seed = rng.integers(9999)
-        if isinstance(seed, int):
+            seed = rng.integers(1, 10000)
+        # numpy integers are also accepted, e.g. from SeedSequence states
+        if isinstance(seed, (int, np.integer)):
             if seed <= 0:
                 raise ValueError("seed must be positive")
-        else:
-            raise TypeError("seed must be int")
+        elif not isinstance(
+            seed, (
+                np.random.SeedSequence, np.random.BitGenerator,
+                np.random.Generator
+            )
+        ):
+            raise TypeError(
+                "seed must be int, SeedSequence, BitGenerator, or Generator"
+            )
         self.seed = seed
-        # initialize RNG
-        self._rng = np.random.default_rng(self.seed)
+        # initialize RNG. a Generator is used as-is, a BitGenerator is wrapped
+        if isinstance(seed, np.random.Generator):
+            self._rng = seed
+        elif isinstance(seed, np.random.BitGenerator):
+            self._rng = np.random.Generator(seed)
+        else:
+            self._rng = np.random.default_rng(seed)
+        # SeedSequence the RNG was seeded with, for reproducibility. None for
+        # numpy < 1.25, where bit generators don't expose their SeedSequence
+        self.seed_seq = getattr(self._rng.bit_generator, "seed_seq", None)
         # optimizer parameters are all checked by the optimization routine
         self.max_iter = max_iter
         self.n_iter_no_change = n_iter_no_change
@@ -94,11 +251,19 @@ class PrimalLinearSVC:
             only contain two unique label values.
         :rtype: float
         """
-        w, b = wb[:-1], wb[-1]
-        return (
-            np.maximum(0, 1 - y * (X @ w + b)).sum() +
-            self.reg_lambda * np.power(w, 2).sum()
-        )
+        # the kernels don't check bounds, so check shapes first
+        if X.shape[0] != y.size:
+            raise ValueError("X, y must have the same number of samples")
+        if wb.size != X.shape[1] + 1:
+            raise ValueError("wb must have shape (n_features + 1,) for X")
+        # the hinge loss buffer is allocated by fit for the fit data, so a new
+        # buffer is used if y has a different size
+        buf = self._margin_buf
+        if buf.size != y.size:
+            buf = np.empty(
+                y.size, dtype = np.promote_types(X.dtype, np.float32)
+            )
+        return _svc_obj(wb, X, y, self.reg_lambda, buf)
 
     def _obj_grad(self, wb, X, y):
         """Gradient of :meth:`_obj_func` for the :class:`PrimalLinearSVC`.
@@ -117,33 +282,92 @@ class PrimalLinearSVC:
 
         :param wb: Weight vector and bias, shape ``(n_features + 1,)``.
         :type wb: :class:`numpy.ndarray`
-        :param X: Input matrix, shape ``(n_samples, n_features)``
+        :param X: Input matrix, shape ``(n_samples, n_features)``. If ``X``
+            and ``y`` are the arrays :meth:`fit` passes to the optimizer, the
+            label-scaled inputs computed by :meth:`fit` are used instead.
         :type X: :class:`numpy.ndarray`
         :param y: Vector of output labels, shape ``(n_samples,)``. Must
             only contain two unique label values.
+        :returns: Gradient, shape ``(n_features + 1,)``. The array is a buffer
+            owned by the instance that is overwritten on the next call.
         :rtype: :class:`numpy.ndarray`
         """
+        # the kernels don't check bounds, so check shapes before indexing
+        if X.shape[0] != y.size:
+            raise ValueError("X, y must have the same number of samples")
+        if wb.size != X.shape[1] + 1 or wb.size != self._grad_buf.size:
+            raise ValueError(
+                "wb must have shape (n_features + 1,) for X and the fit data"
+            )
+        # the index permutation is allocated by fit for the fit data, so it is
+        # rebuilt if y has a different size. it is shuffled below
+        if self._perm.size != y.size:
+            self._perm = np.arange(y.size)
+            self._perm_pos = y.size
         # get indices for minibatch, size self.minibatch_size_. we don't draw
-        # with replacement since we want a strict subset
-        idx = self._rng.choice(
-            y.size, size = self.minibatch_size_, replace = False
-        )
-        # get X, y minibatches and w, b
-        X_batch, y_batch, w, b = X[idx], y[idx], wb[:-1], wb[-1]
-        # array indicating which examples contribute to the gradient
-        update_ind = np.where(y_batch * (X_batch @ w + b) < 1, 1, 0)
-        # compute w gradient and b derivative
-        grad_w = (
-            -(update_ind * y_batch * X_batch.T).sum(axis = 1) +
-            2 * self.reg_lambda * w
-        )
-        grad_b = -(update_ind * y_batch).sum()
-        # return w, b gradient
-        return np.append(grad_w, grad_b)
+        # with replacement since we want a strict subset, so we take the next
+        # slice of the shuffled index permutation, reshuffling once exhausted
+        if self._perm_pos + self.minibatch_size_ > y.size:
+            self._rng.shuffle(self._perm)
+            self._perm_pos = 0
+        idx = self._perm[self._perm_pos:self._perm_pos + self.minibatch_size_]
+        self._perm_pos += self.minibatch_size_
+        # label-scaled inputs. those computed in fit are reused if X, y are the
+        # arrays fit passes to the optimizer, else they are computed from X, y
+        X_fit, y_fit = self._yX_args
+        if X is X_fit and y is y_fit:
+            yX = self._yX
+        else:
+            yX = y[:, None] * X
+        # compute gradient into preallocated buffer and return
+        return _svc_grad(wb, yX, y, idx, self.reg_lambda, self._grad_buf)
+
+    def _init_fit_state(self, X, y):
+        """Set up the fit-time state used by the objective and gradient.
+
+        .. note::
+
+           Users should not call this function. Consider it internal.
+
+        Sets :attr:`n_features_`, :attr:`minibatch_size_`, the label-scaled
+        inputs, the gradient and hinge loss buffers, and the minibatch index
+        permutation. Called by :meth:`fit` after ``X``, ``y`` are converted.
+
+        :param X: Input matrix, shape ``(n_samples, n_features)``
+        :type X: :class:`numpy.ndarray`
+        :param y: Vector of -1, 1 output labels, shape ``(n_samples,)``
+        :type y: :class:`numpy.ndarray`
+        """
+        # inputs scaled by their labels. y is fixed during fitting, so this
+        # saves the gradient from rescaling each minibatch at every step. the
+        # arrays they are computed from are kept for the gradient to check
+        self._yX = y[:, None] * X
+        self._yX_args = (X, y)
+        # set n_features as attribute
+        self.n_features_ = X.shape[1]
+        # buffer the gradient is written to, reused across gradient calls
+        self._grad_buf = np.empty(self.n_features_ + 1)
+        # buffer for the hinge losses, reused across objective calls
+        self._margin_buf = np.empty(y.size, dtype = X.dtype)
+        # batch size to be passed to the gradient function. need to handle the
+        # the case where batch_size is a float and when it is an int
+        if self.batch_size > 0 and self.batch_size < 1:
+            self.minibatch_size_ = int(self.batch_size * y.size)
+        else:
+            self.minibatch_size_ = self.batch_size
+        # index permutation minibatches are sliced from. position starts past
+        # the end so that the permutation is shuffled on first gradient call
+        self._perm = np.arange(y.size)
+        self._perm_pos = y.size
 
     def fit(self, X, y):
         """Fit the linear support vector machine using Adam.
 
+        .. note::
+
+           ``X`` and ``y`` are converted to C-contiguous ``numpy.float32``
+           arrays before fitting. The parameters are still ``numpy.float64``.
+
         :param X: Input matrix, shape ``(n_samples, n_features)``
         :type X: :class:`numpy.ndarray`
         :param y: Vector of output labels, shape ``(n_samples,)``. Must
@@ -174,20 +398,16 @@ class PrimalLinearSVC:
         # sort labels and set as attribute
         labels.sort()
         self.classes_ = labels
-        # translate y in to -1, 1
-        y = np.where(y == labels[0], -1, 1)
-        # set n_features as attribute
-        self.n_features_ = X.shape[1]
-        # batch size to be passed to the gradient function. need to handle the
-        # the case where batch_size is a float and when it is an int
-        if self.batch_size > 0 and self.batch_size < 1:
-            self.minibatch_size_ = int(self.batch_size * y.size)
-        else:
-            self.minibatch_size_ = self.batch_size
-        # initial random parameter guess
-        x0 = self._rng.multivariate_normal(
-            np.zeros(self.n_features_), np.eye(self.n_features_)
-        )
+        # translate y in to -1, 1. X, y are made C-contiguous float32 since
+        # double precision doesn't help hinge loss SGD but doubles the memory
+        # traffic of the matrix-vector products in the objective and gradient
+        y = np.where(y == labels[0], np.float32(-1), np.float32(1))
+        X = np.ascontiguousarray(X, dtype = np.float32)
+        # set up the state used by the objective and gradient
+        self._init_fit_state(X, y)
+        # initial random parameter guess, weights and bias. standard normal
+        # draws avoid the identity covariance allocation + decomposition
+        x0 = self._rng.standard_normal(self.n_features_ + 1)
         # pass objective, gradient functions, X, y hyperparams to optimizer.
         # the returned numpy.ndarray are the final chosen parameters.
         """
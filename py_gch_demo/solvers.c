@@ -577,64 +577,17 @@ static PyObject *adam_impl(PyObject *self, PyObject *args, PyObject *kwargs) {
       Py_DECREF(grad_var);
       return NULL;
     }
-    // number of operands going into the multi-iterator
-    int n_iter_ops = 4;
-    // array of PyArrayObject * for params, grad_val, grad_mean, grad_var so
-    // that we can use them together in the multi-iterator
-    PyArrayObject *iter_ops[] = {
-      params, (PyArrayObject *) grad_val, (PyArrayObject *) grad_mean,
-      (PyArrayObject *) grad_var
-    };
     /**
-     * flags for each of the operands. grad_val is read-only but the other
-     * operands are all read + write (updated). we also specify the data to
-     * be in native byte order and to be aligned for each operand using the
-     * NPY_ITER_NBO | NPY_ITER_ALIGNED flag combination.
+     * get grad_val as an aligned, C-contiguous NPY_DOUBLE array (safe casting
+     * only). no copy is made if grad returns such an array already, e.g. a
+     * preallocated buffer, so we can update directly through data pointers
+     * instead of setting up a new multi-iterator on every iteration.
      */
-    npy_uint32 iter_op_flags[n_iter_ops];
-    // flags for params
-    iter_op_flags[0] = NPY_ITER_READWRITE | NPY_ITER_NBO | NPY_ITER_ALIGNED;
-    // flags for grad_val
-    iter_op_flags[1] = NPY_ITER_READONLY | NPY_ITER_NBO | NPY_ITER_ALIGNED;
-    // flags for grad_mean
-    iter_op_flags[2] = NPY_ITER_READWRITE | NPY_ITER_NBO | NPY_ITER_ALIGNED;
-    // flags for grad_var
-    iter_op_flags[3] = NPY_ITER_READWRITE | NPY_ITER_NBO | NPY_ITER_ALIGNED;
-    /**
-     * array of PyArray_Descr * to specify types to the multi-iterator. we
-     * only need one because we can just borrow references. after initializing
-     * the iterator we can Py_DECREF iter_op_types[0] since the iterator
-     * internally Py_INCREF's each PyArray_Descr * provided.
-     */
-    PyArray_Descr *iter_op_dtypes[n_iter_ops];
-    iter_op_dtypes[0] = PyArray_DescrFromType(NPY_DOUBLE);
-    // on error, Py_DECREF params, f_args, grad_val grad_mean, grad_var
-    if (iter_op_dtypes[0] == NULL) {
-      Py_DECREF(params);
-      Py_DECREF(f_args);
-      Py_DECREF(grad_val);
-      Py_DECREF(grad_mean);
-      Py_DECREF(grad_var);
-      return NULL;
-    }
-    // borrow references from iter_op_dtypes[0]
-    for (int i = 1; i < n_iter_ops; i++) {
-      iter_op_dtypes[i] = iter_op_dtypes[0];
-    }
-    /**
-     * use multi-iterator to update grad_mean, grad_var, params using grad_val
-     * values. since all numpy.ndarray types are NPY_DOUBLE, NPY_NO_CASTING
-     * is passed as the casting flag. multi-iterator tracks C index and goes
-     * through elements in original (C) order.
-     */
-    NpyIter *iter = NpyIter_MultiNew(
-      n_iter_ops, iter_ops, NPY_ITER_C_INDEX, NPY_KEEPORDER,
-      NPY_NO_CASTING, iter_op_flags, iter_op_dtypes
+    PyArrayObject *grad_arr = (PyArrayObject *) PyArray_FROM_OTF(
+      grad_val, NPY_DOUBLE, NPY_ARRAY_IN_ARRAY
     );
-    // don't need the PyArray_Descr * anymore
-    Py_DECREF(iter_op_dtypes[0]);
     // on error, Py_DECREF params, f_args, grad_val, grad_mean, grad_var
-    if (iter == NULL) {
+    if (grad_arr == NULL) {
       Py_DECREF(params);
       Py_DECREF(f_args);
       Py_DECREF(grad_val);
@@ -642,50 +595,53 @@ static PyObject *adam_impl(PyObject *self, PyObject *args, PyObject *kwargs) {
       Py_DECREF(grad_var);
       return NULL;
     }
-    // get NpyIter_IterNextFunc that handles iteration
-    NpyIter_IterNextFunc *iternext = NpyIter_GetIterNext(iter, NULL);
-    // on error, Py_DECREF params, f_args, grad_val, grad_mean, grad_var and
-    // deallocate iter using NpyIter_Deallocate
-    if (iter == NULL) {
+    // number of parameters. gradient must have the same number of elements.
+    // on error, Py_DECREF params, f_args, grad_val, grad_arr, grad_mean,
+    // grad_var (new refs)
+    npy_intp n_params = PyArray_SIZE(params);
+    if (PyArray_SIZE(grad_arr) != n_params) {
+      PyErr_SetString(
+        PyExc_ValueError, "grad must return an array with the same size as x0"
+      );
       Py_DECREF(params);
       Py_DECREF(f_args);
       Py_DECREF(grad_val);
+      Py_DECREF(grad_arr);
       Py_DECREF(grad_mean);
       Py_DECREF(grad_var);
-      // if there is an error we are returning NULL anyways
-      NpyIter_Deallocate(iter);
       return NULL;
     }
-    // pointer to array of pointers to next iteration elements
-    char **iter_op_data = NpyIter_GetDataPtrArray(iter);
-    // we update each element of params, grad_mean, grad_var
-    do {
-      // pointers to next element of params, grad_val, grad_mean, grad_var
-      double *param_ep = (double *) iter_op_data[0];
-      double *grad_val_ep = (double *) iter_op_data[1];
-      double *grad_mean_ep = (double *) iter_op_data[2];
-      double *grad_var_ep = (double *) iter_op_data[3];
+    // pointers to data of params, grad_arr, grad_mean, grad_var. all are
+    // aligned, C-contiguous NPY_DOUBLE arrays
+    double *param_p = (double *) PyArray_DATA(params);
+    double *grad_val_p = (double *) PyArray_DATA(grad_arr);
+    double *grad_mean_p = (double *) PyArray_DATA((PyArrayObject *) grad_mean);
+    double *grad_var_p = (double *) PyArray_DATA((PyArrayObject *) grad_var);
+    // bias corrections for the moment estimates, same for all elements
+    double mean_corr = 1 - pow(beta_1, iter_i + 1);
+    double var_corr = 1 - pow(beta_2, iter_i + 1);
+    /**
+     * update each element of params, grad_mean, grad_var. no Python API calls
+     * are made, so like numpy we release the GIL if there are enough elements
+     * for it to be worth it. the GIL must be held when calling obj, grad.
+     */
+    NPY_BEGIN_THREADS_DEF;
+    NPY_BEGIN_THREADS_THRESHOLDED(n_params);
+    for (npy_intp i = 0; i < n_params; i++) {
       // update element of biased first moment estimate
-      *grad_mean_ep = beta_1 * (*grad_mean_ep) + (1 - beta_1) * (*grad_val_ep);
+      grad_mean_p[i] = beta_1 * grad_mean_p[i] + (1 - beta_1) * grad_val_p[i];
       // update element of biased second raw moment estimate
-      *grad_var_ep = beta_2 * (*grad_var_ep) + (1 - beta_2) * (*grad_var_ep);
+      grad_var_p[i] = beta_2 * grad_var_p[i] + (1 - beta_2) * grad_var_p[i];
       // update element of parameter using bias-corrected first and second
       // moment element estimates (no temp variable)
-      *param_ep = (
-        *param_ep - alpha * (*grad_mean_ep) / (1 - pow(beta_1, iter_i + 1)) /
-        (sqrt((*grad_var_ep) / (1 - pow(beta_2, iter_i + 1))) + eps)
+      param_p[i] = (
+        param_p[i] - alpha * grad_mean_p[i] / mean_corr /
+        (sqrt(grad_var_p[i] / var_corr) + eps)
       );
-    } while (iternext(iter));
-    // deallocate multi-iterator now that we are done updating. on error we
-    // Py_DECREF params, f_args, grad_val, grad_mean, grad_var
-    if (NpyIter_Deallocate(iter) != NPY_SUCCEED) {
-      Py_DECREF(params);
-      Py_DECREF(f_args);
-      Py_DECREF(grad_val);
-      Py_DECREF(grad_mean);
-      Py_DECREF(grad_var);
-      return NULL;
     }
+    NPY_END_THREADS;
+    // grad_arr no longer needed (grad_val is kept for the result)
+    Py_DECREF(grad_arr);
     // compute new objective value, get as PyObject * + increment n_obj_eval
     obj_val_ = PyObject_Call(obj, f_args, f_kwargs);
     n_obj_eval++;
@@ -729,6 +685,21 @@ static PyObject *adam_impl(PyObject *self, PyObject *args, PyObject *kwargs) {
   Py_DECREF(f_args);
   Py_DECREF(grad_mean);
   Py_DECREF(grad_var);
+  /**
+   * replace grad_val with a copy, since the gradient function may return a
+   * buffer it owns and overwrites on later calls, which would then silently
+   * change the gradient saved in the GradSolverResult.
+   */
+  PyObject *grad_copy = PyArray_FROM_OTF(
+    grad_val, NPY_DOUBLE, NPY_ARRAY_IN_ARRAY | NPY_ARRAY_ENSURECOPY
+  );
+  Py_DECREF(grad_val);
+  // on error, Py_DECREF params
+  if (grad_copy == NULL) {
+    Py_DECREF(params);
+    return NULL;
+  }
+  grad_val = grad_copy;
   /**
    * we now build new argument tuple from params, obj_val (convert), grad_val,
    * n_obj_eval (convert), n_grad_eval (convert), iter_i (convert). first,
@@ -0,0 +1,198 @@
+__doc__ = "Ridge objective and gradient kernels used by the Adam tests."
+
+import numpy as np
+
+# numba and scipy are optional. if numba is unavailable, the ridge objective
+# and gradient call BLAS directly through scipy, else they use NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+try:
+    from scipy.linalg.blas import dgemv
+except ImportError:
+    dgemv = None
+
+# contraction path for X_batch.T @ pred_diff in _ridge_grad_numpy, computed
+# once so np.einsum doesn't search for it on every call. the path for two
+# operands doesn't depend on their shapes so placeholder arrays are used.
+_RIDGE_GRAD_PATH, _ = np.einsum_path(
+    "ij,i->j", np.empty((2, 2)), np.empty(2), optimize = "optimal"
+)
+
+
+def _ridge_obj_numpy(x, X_, y_, reg_lambda):
+    """NumPy implementation of the ridge objective used by the Adam tests.
+
+    :param x: Weight vector with concatenated bias, shape ``(n_features + 1,)``
+    :type x: :class:`numpy.ndarray`
+    :param X_: Input matrix, shape ``(n_samples, n_features)``
+    :type X_: :class:`numpy.ndarray`
+    :param y_: Regression targets, shape ``(n_samples,)``
+    :type y_: :class:`numpy.ndarray`
+    :param reg_lambda: Coefficient of the squared weight norm penalty
+    :type reg_lambda: float
+    :rtype: float
+    """
+    # weights, bias
+    w, b = x[:-1], x[-1]
+    # residuals, bias subtracted in place
+    resid = y_ - X_ @ w
+    resid -= b
+    # return objective value, squared norms computed as dot products
+    return resid @ resid + reg_lambda * (w @ w)
+
+
+def _ridge_grad_numpy(x, X_, y_, idx, reg_lambda, out):
+    """NumPy implementation of the ridge minibatch gradient.
+
+    See :func:`_ridge_obj_numpy` for descriptions of the shared parameters.
+
+    :param idx: Indices of the minibatch examples, shape ``(batch_size,)``
+    :type idx: :class:`numpy.ndarray`
+    :param out: Output buffer to write the gradient to, shape
+        ``(n_features + 1,)``
+    :type out: :class:`numpy.ndarray`
+    :returns: ``out``
+    :rtype: :class:`numpy.ndarray`
+    """
+    # weights, bias
+    w, b = x[:-1], x[-1]
+    # get X_batch, y_batch
+    X_batch, y_batch = X_[idx], y_[idx]
+    # -2 times the difference between regression targets and predictions,
+    # computed in place in the buffer from X_batch @ w. folding the -2 into
+    # the residuals means the contraction and sum need no further scaling
+    pred_diff = X_batch @ w
+    pred_diff += b
+    pred_diff -= y_batch
+    pred_diff *= 2.
+    # compute w stochastic gradient directly into the w view of out
+    grad_w = out[:-1]
+    np.einsum(
+        "ij,i->j", X_batch, pred_diff, out = grad_w,
+        optimize = _RIDGE_GRAD_PATH
+    )
+    grad_w += (2 * reg_lambda) * w
+    # compute b stochastic derivative
+    out[-1] = pred_diff.sum()
+    return out
+
+
+def _ridge_obj_blas(x, X_, y_, reg_lambda):
+    """BLAS implementation of the ridge objective using ``scipy``.
+
+    Calls ``dgemv`` directly to skip the dispatch overhead of ``@``. Since
+    ``dgemv`` expects Fortran-ordered matrices, the transpose of the
+    C-ordered ``X_`` is passed with ``trans = 1`` so that no copy is made.
+    Same signature as :func:`_ridge_obj_numpy`.
+
+    :rtype: float
+    """
+    # weights, bias
+    w, b = x[:-1], x[-1]
+    # residuals y_ - X_ @ w from a single gemv, bias subtracted in place
+    resid = dgemv(-1., X_.T, w, beta = 1., y = y_, trans = 1)
+    resid -= b
+    # return objective value, squared norms computed as dot products
+    return resid @ resid + reg_lambda * (w @ w)
+
+
+def _ridge_grad_blas(x, X_, y_, idx, reg_lambda, out):
+    """BLAS implementation of the ridge minibatch gradient using ``scipy``.
+
+    Calls ``dgemv`` directly to skip the dispatch overhead of ``@``. See
+    :func:`_ridge_obj_blas` for why transposes are passed. Same signature as
+    :func:`_ridge_grad_numpy`.
+
+    :returns: ``out``
+    :rtype: :class:`numpy.ndarray`
+    """
+    # weights, bias
+    w, b = x[:-1], x[-1]
+    # get X_batch, y_batch. both are copies, so y_batch can be overwritten
+    X_batch, y_batch = X_[idx], y_[idx]
+    # -2 times the difference between regression targets and predictions.
+    # X_batch @ w - y_batch is computed in place in y_batch by one gemv
+    pred_diff = dgemv(
+        1., X_batch.T, w, beta = -1., y = y_batch, trans = 1,
+        overwrite_y = True
+    )
+    pred_diff += b
+    pred_diff *= 2.
+    # compute w stochastic gradient, penalty included, in one gemv that
+    # accumulates into the w view of out, which is first set to w
+    out[:-1] = w
+    out[:-1] = dgemv(
+        1., X_batch.T, pred_diff, beta = 2 * reg_lambda, y = out[:-1],
+        overwrite_y = True
+    )
+    # compute b stochastic derivative
+    out[-1] = pred_diff.sum()
+    return out
+
+
+def _ridge_obj_loop(x, X_, y_, reg_lambda):
+    """Loop implementation of the ridge objective.
+
+    Intended to be compiled with ``numba``. Same signature as
+    :func:`_ridge_obj_numpy`.
+
+    :rtype: float
+    """
+    n_features = x.size - 1
+    b = x[n_features]
+    # sum of squared residuals, one pass over X_
+    loss = 0.
+    for i in range(y_.size):
+        resid = y_[i] - b
+        for j in range(n_features):
+            resid -= X_[i, j] * x[j]
+        loss += resid * resid
+    # squared l2 norm of the weights
+    w_norm2 = 0.
+    for j in range(n_features):
+        w_norm2 += x[j] * x[j]
+    return loss + reg_lambda * w_norm2
+
+
+def _ridge_grad_loop(x, X_, y_, idx, reg_lambda, out):
+    """Loop implementation of the ridge minibatch gradient.
+
+    Intended to be compiled with ``numba``. Same signature as
+    :func:`_ridge_grad_numpy`.
+
+    :returns: ``out``
+    :rtype: :class:`numpy.ndarray`
+    """
+    n_features = x.size - 1
+    b = x[n_features]
+    # start from the penalty gradient (bias is not penalized)
+    for j in range(n_features):
+        out[j] = 2 * reg_lambda * x[j]
+    out[n_features] = 0.
+    # accumulate contributions of each minibatch example
+    for i in range(idx.size):
+        k = idx[i]
+        resid = y_[k] - b
+        for j in range(n_features):
+            resid -= X_[k, j] * x[j]
+        for j in range(n_features):
+            out[j] -= 2 * resid * X_[k, j]
+        out[n_features] -= 2 * resid
+    return out
+
+
+# ridge objective and gradient implementations used by adam_ridge_args.
+# the compiled kernels are also exposed for testing, as in models.py
+if njit is None:
+    _ridge_obj_numba = _ridge_grad_numba = None
+else:
+    _ridge_obj_numba = njit(cache = True, fastmath = True)(_ridge_obj_loop)
+    _ridge_grad_numba = njit(cache = True, fastmath = True)(_ridge_grad_loop)
+if njit is not None:
+    _ridge_obj, _ridge_grad = _ridge_obj_numba, _ridge_grad_numba
+elif dgemv is not None:
+    _ridge_obj, _ridge_grad = _ridge_obj_blas, _ridge_grad_blas
+else:
+    _ridge_obj, _ridge_grad = _ridge_obj_numpy, _ridge_grad_numpy
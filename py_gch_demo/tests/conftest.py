@@ -1,14 +1,143 @@
 __doc__ = "Fixtures for :mod:`py_gch_demo.tests`."
 
+import hashlib
+import inspect
+import os
+import pathlib
+import shutil
+import tempfile
+
 import numpy as np
 import pytest
 
 from ..data import make_linear_regression, make_linear_binary_classification
 from ..models import PrimalLinearSVC
+from ._ridge import _ridge_obj, _ridge_grad
+
+# number of rows in the adam_ridge_args minibatch index pool. this is the
+# default max_iter value for py_gch_demo.solvers.adam_optimizer.
+MAX_ITERS = 200
+# names of the arrays returned by the data set fixtures, in order
+_DATA_NAMES = ("X_train", "X_test", "y_train", "y_test")
+# entropy of the root SeedSequence that fixture RNGs are derived from
+_SEED_ENTROPY = 999
+# spawn keys of the SeedSequence children used by each fixture's RNG
+_DATA_X0_SPAWN_KEY = (0,)
+_ADAM_RIDGE_SPAWN_KEY = (1,)
+
+
+def _fixture_rng(spawn_key):
+    """Returns a new RNG for a fixture, derived from a child ``SeedSequence``.
+
+    Each fixture gets an independent stream from a child of the root seed
+    with its own fixed spawn key. Unlike
+    :meth:`numpy.random.SeedSequence.spawn`, this doesn't depend on the order
+    fixtures are set up in, so streams are the same no matter which tests are
+    selected or how they are distributed across workers. The bit generator is
+    ``PCG64DXSM`` if available (``numpy`` >= 1.21), else ``PCG64``.
+
+    :param spawn_key: Spawn key of the child ``SeedSequence``
+    :type spawn_key: tuple
+    :rtype: :class:`numpy.random.Generator`
+    """
+    bit_gen_type = getattr(np.random, "PCG64DXSM", np.random.PCG64)
+    return np.random.Generator(
+        bit_gen_type(
+            np.random.SeedSequence(_SEED_ENTROPY, spawn_key = spawn_key)
+        )
+    )
+
+
+def pytest_addoption(parser):
+    """Add command-line options used by the fixtures.
+
+    :param parser: ``pytest`` command-line option parser
+    :type parser: :class:`pytest.Parser`
+    """
+    parser.addoption(
+        "--no-cache-data", action = "store_true",
+        help = "regenerate data set fixtures instead of loading them from "
+        "the pytest cache directory"
+    )
+
+
+def _read_only(data):
+    """Makes the arrays of a data set read-only and returns them.
+
+    Freshly generated data is made read-only so that it behaves the same as
+    data memory-mapped from the cache, whatever the state of the cache.
+
+    :param data: ``X_train``, ``X_test``, ``y_train``, ``y_test``
+    :type data: tuple
+    :rtype: tuple
+    """
+    for arr in data:
+        arr.setflags(write = False)
+    return data
+
+
+def _cached_data(config, func, **kwargs):
+    """Returns the data set returned by ``func(**kwargs)``, cached on disk.
+
+    Since the data set fixtures use fixed seeds, the arrays are saved as
+    ``.npy`` files in the ``pytest`` cache directory and memory-mapped
+    read-only on later sessions. See :func:`_read_only` for freshly generated
+    arrays. The cache key is a hash of ``func``, ``kwargs``, the source of the
+    module defining ``func``, and the ``numpy`` version, so data is
+    regenerated if any of these change. Caching is skipped if ``rng`` is not
+    an int seed, if the cache provider plugin is disabled, or if
+    ``--no-cache-data`` is passed.
+
+    :param config: ``pytest`` config object
+    :type config: :class:`pytest.Config`
+    :param func: Function returning ``X_train, X_test, y_train, y_test``
+    :type func: function
+    :param kwargs: Keyword arguments to pass to ``func``
+    :returns: ``X_train``, ``X_test``, ``y_train``, ``y_test``
+    :rtype: tuple
+    """
+    cache = getattr(config, "cache", None)
+    if (
+        cache is None or config.getoption("no_cache_data") or
+        not isinstance(kwargs.get("rng"), int)
+    ):
+        return _read_only(func(**kwargs))
+    # hash everything the data depends on to get the data set directory
+    key = hashlib.sha256()
+    key.update(repr((func.__name__, sorted(kwargs.items()))).encode())
+    key.update(inspect.getsource(inspect.getmodule(func)).encode())
+    key.update(np.__version__.encode())
+    path = cache.mkdir("datasets") / key.hexdigest()[:16]
+    # load from the cache if the data has been saved
+    if path.is_dir():
+        try:
+            return tuple(
+                np.load(path / f"{name}.npy", mmap_mode = "r")
+                for name in _DATA_NAMES
+            )
+        # unreadable entry. it is left alone since other processes may have
+        # it mapped, so the data is generated without being cached
+        except (OSError, ValueError):
+            return _read_only(func(**kwargs))
+    # else generate data and save it to a temporary directory that is then
+    # moved into place, so readers, e.g. other pytest-xdist workers, only
+    # ever see complete entries
+    data = func(**kwargs)
+    tmp_path = pathlib.Path(
+        tempfile.mkdtemp(prefix = f"{path.name}.", dir = path.parent)
+    )
+    for name, arr in zip(_DATA_NAMES, data):
+        np.save(tmp_path / f"{name}.npy", arr)
+    try:
+        os.replace(tmp_path, path)
+    # another process moved its entry into place first
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors = True)
+    return _read_only(data)
 
 
 @pytest.fixture(scope = "session")
-def lr_data():
+def lr_data(pytestconfig):
     """Data set of a linear regression problem.
 
     Features are zero-mean, identity covariance multivariate Gaussian with a
@@ -17,16 +146,21 @@ def lr_data():
     ``output_mean`` is set to ``8`` and gives the true intercept value. Input
     dimensionality is 10.
 
+    The data is cached across sessions. See :func:`_cached_data`.
+
+    :param pytestconfig: ``pytest`` fixture. The built-in config fixture.
+    :type pytestconfig: :class:`pytest.Config`
     :returns: ``X_train``, ``X_test``, ``y_train``, ``y_test``
     :rtype: tuple
     """
-    return make_linear_regression(
-        n_train = 2000, n_test = 500, output_mean = 8, rng = 7
+    return _cached_data(
+        pytestconfig, make_linear_regression, n_train = 2000, n_test = 500,
+        output_mean = 8, rng = 7
     )
 
 
 @pytest.fixture(scope = "session")
-def svm_data():
+def svm_data(pytestconfig):
     r"""Data set for linear classification problem for an SVM.
 
     Features are zero-mean, identity covariance multivariate Gaussian with a
@@ -36,11 +170,16 @@ def svm_data():
     in :math:`\{-1, 1\} and appropriate for use with an SVM. The input
     dimensionality is 10.
 
+    The data is cached across sessions. See :func:`_cached_data`.
+
+    :param pytestconfig: ``pytest`` fixture. The built-in config fixture.
+    :type pytestconfig: :class:`pytest.Config`
     :returns: ``X_train``, ``X_test``, ``y_train``, ``y_test``
     :rtype: tuple
     """
-    return make_linear_binary_classification(
-        n_train = 2000, n_test = 500, label_type = "+/-1", rng = 7
+    return _cached_data(
+        pytestconfig, make_linear_binary_classification, n_train = 2000,
+        n_test = 500, label_type = "+/-1", rng = 7
     )
 
 
@@ -73,8 +212,7 @@ def data_x0():
         :class:`py_gch_demo.models.PrimalLinearSVC`, shape ``(11,)``.
     :rtype: :class:`numpy.ndarray`
     """
-    rng = np.random.default_rng(999)
-    return rng.multivariate_normal(np.zeros(11), np.eye(11))
+    return _fixture_rng(_DATA_X0_SPAWN_KEY).standard_normal(11)
 
 
 @pytest.fixture(scope = "session")
@@ -102,11 +240,16 @@ def adam_ridge_args(lr_data, data_x0):
     :func:`~py_gch_demo.solvers.adam_optimizer`. The gradient function is
     stochastic and evaluates on minibatches that are a fraction of the data.
     This fraction is specified by the ``batch_frac`` parameter and is ignored
-    by the objective [#]_. The training data is passed as
+    by the objective [#]_. Minibatch indices are drawn with replacement ahead
+    of time for the training data, so the gradient raises ``ValueError`` if
+    ``batch_frac`` exceeds the fixture's value of ``0.25`` or if ``y_`` is
+    not the size of the training targets. The training data is passed as
     ``X_``, ``y_`` to the objective and its gradient function are passed to the
     ``args`` parameter of :func:`py_gch_demo.solvers.adam_optimizer`.
 
-    The bias (intercept) term is not penalized.
+    The bias (intercept) term is not penalized. If ``numba`` is installed, the
+    objective and gradient are computed with JIT-compiled kernels, else if
+    ``scipy`` is installed, they call BLAS directly.
 
     .. [#] The parameter must also be passed to the objective since ``args``,
        ``kwargs`` arguments passed to the Adam optimizer are shared by both
@@ -124,45 +267,53 @@ def adam_ridge_args(lr_data, data_x0):
     """
     # ridge objective function
     def ridge_obj(x, X_, y_, reg_lambda = 0.1, batch_frac = 0.2):
-        # weights, bias
-        w, b = x[:-1], x[-1]
-        # return objective value
-        return (
-            np.power(y_ - X_ @ w - b, 2).sum() +
-            reg_lambda * np.power(w, 2).sum()
-        )
+        return _ridge_obj(x, X_, y_, reg_lambda)
     
-    # random number generator used by the gradient function
-    rng = np.random.default_rng(7)
+    # unpack lr_data fixture to get X, y training data. ensure that they are
+    # C-contiguous float64 so the products in the objective and gradient go
+    # straight to BLAS without an implicit copy or cast on each call
+    X, _, y, _ = lr_data
+    X = np.ascontiguousarray(X, dtype = np.float64)
+    y = np.ascontiguousarray(y, dtype = np.float64)
+    # values for reg_lambda, batch_frac passed to kwargs
+    kwargs = dict(reg_lambda = 0.2, batch_frac = 0.25)
+    # pool of minibatch indices, one row per gradient call, drawn up front
+    # (with replacement, which is fine for SGD) so that the gradient function
+    # only needs to read the next row. rows are reused cyclically.
+    rng = _fixture_rng(_ADAM_RIDGE_SPAWN_KEY)
+    idx_pool = rng.choice(
+        y.size, size = (MAX_ITERS, int(kwargs["batch_frac"] * y.size))
+    ).astype(np.int32)
+    # number of times the gradient function has been called
+    n_grad_calls = 0
+    # buffer the gradient is written to, reused across gradient calls
+    grad_buf = np.empty(data_x0.size)
     
     # ridge gradient function
     def ridge_grad(x, X_, y_, reg_lambda = 0.1, batch_frac = 0.2):
-        # weights, bias
-        w, b = x[:-1], x[-1]
-        # selected data indices for minibatch (draw without replacement)
-        idx = rng.choice(
-            y_.size, size = int(batch_frac * y_.size), replace = False
-        )
-        # get X_batch, y_batch
-        X_batch, y_batch = X_[idx], y_[idx]
-        # difference between regression targets and predictions
-        pred_diff = y_batch - X_batch @ w - b
-        # compute w stochastic gradient
-        grad_w = -2 * X_batch.T @ pred_diff + 2 * reg_lambda * w
-        # compute b stochastic derivative
-        grad_b = -2 * pred_diff.sum()
-        # return (w, b)
-        return np.append(grad_w, grad_b)
-    
-    # unpack lr_data fixture to get X, y training data
-    X, _, y, _ = lr_data
+        nonlocal n_grad_calls
+        # idx_pool indexes the fixture's training data and its rows only hold
+        # enough indices for the fixture's batch_frac
+        if y_.size != y.size:
+            raise ValueError(
+                f"y_ must have size {y.size} to index with the minibatch pool"
+            )
+        batch_size = int(batch_frac * y_.size)
+        if batch_size > idx_pool.shape[1]:
+            raise ValueError(
+                f"batch_frac cannot exceed {kwargs['batch_frac']}, the "
+                "fraction the minibatch pool was drawn for"
+            )
+        # selected data indices for minibatch, the next row of idx_pool
+        # truncated to the batch size
+        idx = idx_pool[n_grad_calls % MAX_ITERS, :batch_size]
+        n_grad_calls += 1
+        # compute (w, b) gradient into grad_buf and return
+        return _ridge_grad(x, X_, y_, idx, reg_lambda, grad_buf)
 
     # return objective, gradient, initial guess, data (training data from
     # the lr_data fixture), and values for reg_lambda, batch_frac
-    return (
-        ridge_obj, ridge_grad, data_x0, (X, y),
-        dict(reg_lambda = 0.2, batch_frac = 0.25)
-    )
+    return ridge_obj, ridge_grad, data_x0, (X, y), kwargs
 
 
 @pytest.fixture(scope = "module")
@@ -177,12 +328,16 @@ def tuple_replace():
     :rtype: function
     """
     def _tuple_replacer(op, *args):
-        # op (tuple) as a new list that can be mutated
-        op_ = list(op)
-        # for each idx, val pair, update
+        # map of indices to replacement values. negative indices are
+        # normalized and out of range indices raise, as when indexing op
+        repl = {}
         for idx, val in args:
-            op_[idx] = val
-        # return new tuple from op_
-        return tuple(op_)
+            if not -len(op) <= idx < len(op):
+                raise IndexError("tuple index out of range")
+            repl[idx + len(op) if idx < 0 else idx] = val
+        # build new tuple in a single pass, taking replacements where given
+        return tuple(
+            repl[idx] if idx in repl else val for idx, val in enumerate(op)
+        )
     
     return _tuple_replacer
\ No newline at end of file
@@ -16,62 +16,71 @@ def gsr_args():
     objective was evaluated, number of times the gradient was evaluated, and
     the total number of iterations run.
 
+    The arrays are read-only since the arguments are shared by all the test
+    cases in the module and must not be modified.
+
     :rtype: tuple
     """
-    return (
-        np.array([1.2, 3.2, 0.9]), 19.2, np.array([1.2e-3, 1.33e-5, 5.6e-2]),
-        122, 121, 121
-    )
+    x = np.array([1.2, 3.2, 0.9])
+    x.setflags(write = False)
+    grad = np.array([1.2e-3, 1.33e-5, 5.6e-2])
+    grad.setflags(write = False)
+    return x, 19.2, grad, 122, 121, 121
 
 
-def test_GradSolverResult_sanity(gsr_args, tuple_replace):
+@pytest.mark.parametrize(
+    "idx,bad_val,exc,match",
+    [
+        # parameter guess must be numpy.ndarray
+        (0, [1, 2, 1, 2], TypeError, None),
+        # parameter guess must have at least one dimension
+        (0, np.array(9), ValueError, "x must have at least 1 dimension"),
+        # parameter guess and gradient value must have the same dimensions
+        (
+            0, np.array([[1, 2], [9, 3]]), ValueError,
+            "x, grad must have the same number of dimensions"
+        ),
+        # parameter guess and gradient value must have the same shape
+        (0, np.array([1, 2]), ValueError, "x, grad shapes differ on axis 0"),
+        # objective value must be castable to double
+        (1, "cheese", TypeError, None),
+        # gradient value must be numpy.ndarray
+        (2, [1, 2, 1, 2], TypeError, None),
+        # gradient value must have at least one dimension
+        (2, np.array(8), ValueError, None),
+        # number of objective evals must be int
+        (3, 1.9, TypeError, None),
+        # number of objective evals must be positive
+        (3, 0, ValueError, "n_obj_eval must be positive"),
+        # number of gradient evals must be int
+        (4, 1.99, TypeError, None),
+        # number of gradient evals must be positive
+        (4, 0, ValueError, "n_grad_eval must be positive"),
+        # number of iterations must be int
+        (5, 9.8, TypeError, None),
+        # number of iterations must be positive
+        (5, 0, ValueError, "n_iter must be positive")
+    ]
+)
+def test_GradSolverResult_sanity(
+    gsr_args, tuple_replace, idx, bad_val, exc, match
+):
     """Sanity checks for the inputs passed to ``GradSolverResult.__new__``.
 
+    Each case replaces one of the valid arguments with a bad value.
+
     :param gsr_args: ``pytest`` fixture. See :func:`gsr_args`.
     :type gsr_args: tuple
     :param tuple_replace: ``pytest`` fixture. See package ``conftest.py``.
     :type tuple_replace: function
+    :param idx: Index of the argument to replace
+    :type idx: int
+    :param bad_val: Bad value to replace the argument with
+    :type bad_val: object
+    :param exc: Expected exception type
+    :type exc: type
+    :param match: Pattern expected to match the exception message, if any
+    :type match: str
     """
-    # parameter guess must be numpy.ndarray
-    with pytest.raises(TypeError):
-        GradSolverResult(*tuple_replace(gsr_args, (0, [1, 2, 1, 2])))
-    # parameter guess must have at least one dimension
-    with pytest.raises(ValueError, match = "x must have at least 1 dimension"):
-        GradSolverResult(*tuple_replace(gsr_args, (0, np.array(9))))
-    # parameter guess and gradient value must have the same dimensions
-    with pytest.raises(
-        ValueError, match = "x, grad must have the same number of dimensions"
-    ):
-        GradSolverResult(
-            *tuple_replace(gsr_args, (0, np.array([[1, 2], [9, 3]])))
-        )
-    # parameter guess and gradient value must have the same shape
-    with pytest.raises(ValueError, match = "x, grad shapes differ on axis 0"):
-        GradSolverResult(*tuple_replace(gsr_args, (0, np.array([1, 2]))))
-    # objective value must be castable to double
-    with pytest.raises(TypeError):
-        GradSolverResult(*tuple_replace(gsr_args, (1, "cheese")))
-    # gradient value must be numpy.ndarray
-    with pytest.raises(TypeError):
-        GradSolverResult(*tuple_replace(gsr_args, (2, [1, 2, 1, 2])))
-    # gradient value must have at least one dimension
-    with pytest.raises(ValueError):
-        GradSolverResult(*tuple_replace(gsr_args, (2, np.array(8))))
-    # number of objective evals must be int
-    with pytest.raises(TypeError):
-        GradSolverResult(*tuple_replace(gsr_args, (3, 1.9)))
-    # number of objective evals must be positive
-    with pytest.raises(ValueError, match = "n_obj_eval must be positive"):
-        GradSolverResult(*tuple_replace(gsr_args, (3, 0)))
-    # number of gradient evals must be int
-    with pytest.raises(TypeError):
-        GradSolverResult(*tuple_replace(gsr_args, (4, 1.99)))
-    # number of gradient evals must be int
-    with pytest.raises(ValueError, match = "n_grad_eval must be positive"):
-        GradSolverResult(*tuple_replace(gsr_args, (4, 0)))
-    # number of iterations must be int
-    with pytest.raises(TypeError):
-        GradSolverResult(*tuple_replace(gsr_args, (5, 9.8)))
-    # number of iterations must be positive
-    with pytest.raises(ValueError, match = "n_iter must be positive"):
-        GradSolverResult(*tuple_replace(gsr_args, (5, 0)))
\ No newline at end of file
+    with pytest.raises(exc, match = match):
+        GradSolverResult(*tuple_replace(gsr_args, (idx, bad_val)))
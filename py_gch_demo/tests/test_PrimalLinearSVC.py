@@ -3,6 +3,7 @@ __doc__ = "Unit tests for :class:`py_gch_demo.models.PrimalLinearSVC`."
 import numpy as np
 import pytest
 
+from .. import models
 from ..models import PrimalLinearSVC
 
 
@@ -45,6 +46,28 @@ def test_constructor_sanity():
         np.random.default_rng(7)._bit_generator.state == 
         svc._rng._bit_generator.state
     )
+    # numpy scalars are accepted for reg_lambda, batch_size, and seed
+    svc = PrimalLinearSVC(
+        reg_lambda = np.float32(0.5), batch_size = np.int64(100),
+        seed = np.uint32(7)
+    )
+    assert svc.seed == 7
+    # seed is drawn if not provided
+    assert PrimalLinearSVC().seed > 0
+    # SeedSequence, BitGenerator, and Generator seeds are accepted
+    seed_seq = np.random.SeedSequence(7)
+    svc = PrimalLinearSVC(seed = seed_seq)
+    assert (
+        np.random.default_rng(7)._bit_generator.state ==
+        svc._rng._bit_generator.state
+    )
+    svc = PrimalLinearSVC(seed = np.random.PCG64(seed_seq))
+    assert (
+        np.random.default_rng(7)._bit_generator.state ==
+        svc._rng._bit_generator.state
+    )
+    rng = np.random.default_rng(7)
+    assert PrimalLinearSVC(seed = rng)._rng is rng
 
 
 def test_obj_func(linsvm, svm_data):
@@ -61,24 +84,101 @@ def test_obj_func(linsvm, svm_data):
     n_features = X_train.shape[1]
     # allocate random weight + bias vector. weights w, bias b
     rng = np.random.default_rng(7)
-    wb = rng.multivariate_normal(
-        np.zeros(n_features + 1), np.eye(n_features + 1)
-    )
+    wb = rng.standard_normal(n_features + 1)
     w, b = wb[:-1], wb[-1]
-    # add minibatch_size_ attribute to linsvm (not fitted). batch_size is
-    # float by default so this computation of minibatch_size_ is valid.
-    linsvm.minibatch_size_ = int(linsvm.batch_size * y_train.size)
+    # set up the state fit would (linsvm is not fitted)
+    linsvm._init_fit_state(X_train, y_train)
     # get value of objective
     obj_act = linsvm._obj_func(wb, X_train, y_train)
     # compute expected value of objective
     obj_ex = (
         np.maximum(0, 1 - y_train * (X_train @ w + b)).sum() +
-        linsvm.reg_lambda * np.power(w, 2).sum()
+        linsvm.reg_lambda * (w @ w)
     )
     # check that they are pretty close
     np.testing.assert_allclose(obj_act, obj_ex)
 
 
+@pytest.mark.parametrize("impl", ["numpy", "numba"])
+def test_obj_func_args(linsvm, svm_data, monkeypatch, impl):
+    """Test the objective on data of a different size than the fit data.
+
+    Run with both the NumPy and ``numba`` kernels, since only the NumPy kernel
+    uses the hinge loss buffer. The ``numba`` case is skipped if ``numba`` is
+    not installed.
+
+    :param linsvm: ``pytest`` fixture. See package ``conftest.py``.
+    :type linsvm: :class:`~py_gch_demo.models.PrimalLinearSVC`
+    :param svm_data: ``pytest`` fixture. See package ``conftest.py``.
+    :type svm_data: tuple
+    :param monkeypatch: ``pytest`` fixture. The built-in monkeypatch fixture.
+    :type monkeypatch: :class:`pytest.MonkeyPatch`
+    :param impl: Suffix of the objective kernel name in ``models.py``
+    :type impl: str
+    """
+    if impl == "numba":
+        pytest.importorskip("numba")
+    monkeypatch.setattr(
+        models, "_svc_obj", getattr(models, f"_svc_obj_{impl}")
+    )
+    # set up the state fit would for the training data
+    X_train, X_test, y_train, y_test = svm_data
+    linsvm._init_fit_state(X_train, y_train)
+    wb = np.random.default_rng(7).standard_normal(X_test.shape[1] + 1)
+    w, b = wb[:-1], wb[-1]
+    # objective on the smaller test data should match the expected value
+    np.testing.assert_allclose(
+        linsvm._obj_func(wb, X_test, y_test),
+        np.maximum(0, 1 - y_test * (X_test @ w + b)).sum() +
+        linsvm.reg_lambda * (w @ w)
+    )
+    # X, y with different numbers of samples
+    with pytest.raises(ValueError, match = "same number of samples"):
+        linsvm._obj_func(wb, X_test, y_train)
+
+
+@pytest.mark.parametrize("impl", ["numpy", "numba"])
+def test_obj_func_fit(linsvm, svm_data, monkeypatch, impl):
+    """Test the objective on the ``float32`` inputs ``fit`` converts data to.
+
+    The objective should be accurate to well within the optimizer's ``tol``,
+    else the early stopping check compares rounding noise. The ``numba`` case
+    is skipped if ``numba`` is not installed.
+
+    :param linsvm: ``pytest`` fixture. See package ``conftest.py``.
+    :type linsvm: :class:`~py_gch_demo.models.PrimalLinearSVC`
+    :param svm_data: ``pytest`` fixture. See package ``conftest.py``.
+    :type svm_data: tuple
+    :param monkeypatch: ``pytest`` fixture. The built-in monkeypatch fixture.
+    :type monkeypatch: :class:`pytest.MonkeyPatch`
+    :param impl: Suffix of the objective kernel name in ``models.py``
+    :type impl: str
+    """
+    if impl == "numba":
+        pytest.importorskip("numba")
+    monkeypatch.setattr(
+        models, "_svc_obj", getattr(models, f"_svc_obj_{impl}")
+    )
+    X_train, _, y_train, _ = svm_data
+    linsvm.fit(X_train, y_train)
+    # inputs and -1/1 labels as converted by fit
+    X = X_train.astype(np.float32)
+    y = np.where(y_train == linsvm.classes_[0], -1, 1).astype(np.float32)
+    # float64 reference computed from the same float32 inputs
+    X_ref, y_ref = X.astype(np.float64), y.astype(np.float64)
+    for seed in range(5):
+        wb = np.random.default_rng(seed).standard_normal(X.shape[1] + 1)
+        w, b = wb[:-1], wb[-1]
+        obj_ex = (
+            np.maximum(0, 1 - y_ref * (X_ref @ w + b)).sum() +
+            linsvm.reg_lambda * (w @ w)
+        )
+        np.testing.assert_allclose(
+            linsvm._obj_func(wb, X, y), obj_ex, rtol = 0,
+            atol = linsvm.tol / 4
+        )
+
+
 def test_obj_grad(linsvm, svm_data):
     """Test that the :class:`PrimalLinearSVC` gradient works as intended.
 
@@ -93,20 +193,15 @@ def test_obj_grad(linsvm, svm_data):
     n_samples, n_features = X_train.shape
     # allocate random weight + bias vector. weights w, bias b
     rng = np.random.default_rng(7)
-    wb = rng.multivariate_normal(
-        np.zeros(n_features + 1), np.eye(n_features + 1)
-    )
+    wb = rng.standard_normal(n_features + 1)
     w, b = wb[:-1], wb[-1]
-    # add minibatch_size_ attribute to linsvm (not fitted). batch_size is
-    # float by default so this computation of minibatch_size_ is valid.
-    linsvm.minibatch_size_ = int(linsvm.batch_size * y_train.size)
+    # set up the state fit would (linsvm is not fitted)
+    linsvm._init_fit_state(X_train, y_train)
     # get minibatch gradient
     grad_act = linsvm._obj_grad(wb, X_train, y_train)
     # get minibatch indices (use fresh RNG) and minibatch data
     rng = np.random.default_rng(linsvm.seed)
-    idx = rng.choice(
-        n_samples, size = int(linsvm.batch_size * n_samples), replace = False
-    )
+    idx = rng.permutation(n_samples)[:int(linsvm.batch_size * n_samples)]
     X_batch, y_batch = X_train[idx], y_train[idx]
     # indicator array of examples contributing to gradient
     update_ind = np.where(y_batch * (X_batch @ w + b) < 1, 1, 0)
@@ -121,6 +216,78 @@ def test_obj_grad(linsvm, svm_data):
     np.testing.assert_allclose(grad_act, grad_ex)
 
 
+def test_obj_grad_args(svm_data):
+    """Test the gradient on data other than the data fit was called with.
+
+    :param svm_data: ``pytest`` fixture. See package ``conftest.py``.
+    :type svm_data: tuple
+    """
+    # unpack data. the flipped labels are the other data passed
+    X_train, _, y_train, _ = svm_data
+    y_flip = -y_train
+    n_samples, n_features = X_train.shape
+    wb = np.random.default_rng(7).standard_normal(n_features + 1)
+    # gradients computed by two models with the same seed. the first has the
+    # state fit would set up for X_train, y_train and is passed the flipped
+    # labels, the second has the state set up for the flipped labels
+    grads = []
+    for y_fit in (y_train, y_flip):
+        svc = PrimalLinearSVC(seed = 7)
+        svc._init_fit_state(X_train, y_fit)
+        grads.append(svc._obj_grad(wb, X_train, y_flip))
+    np.testing.assert_allclose(*grads)
+    # data of a different size than the fit data. the minibatch is drawn
+    # from a permutation of the test data indices, which comes after the
+    # first shuffle of the fit data permutation done above
+    _, X_test, _, y_test = svm_data
+    grad_act = svc._obj_grad(wb, X_test, y_test)
+    rng = np.random.default_rng(7)
+    rng.permutation(n_samples)
+    idx = rng.permutation(y_test.size)[:svc.minibatch_size_]
+    grad_ex = models._svc_grad_numpy(
+        wb, y_test[:, None] * X_test, y_test, idx, svc.reg_lambda,
+        np.empty(n_features + 1)
+    )
+    np.testing.assert_allclose(grad_act, grad_ex)
+    # X, y with different numbers of samples
+    with pytest.raises(ValueError, match = "same number of samples"):
+        svc._obj_grad(wb, X_test, y_train)
+
+
+def test_svc_kernels(svm_data):
+    """Test that ``numba`` objective and gradient kernels match NumPy ones.
+
+    Skipped if ``numba`` is not installed.
+
+    :param svm_data: ``pytest`` fixture. See package ``conftest.py``.
+    :type svm_data: tuple
+    """
+    pytest.importorskip("numba")
+    # unpack data
+    X_train, _, y_train, _ = svm_data
+    # number of data samples, number of data features
+    n_samples, n_features = X_train.shape
+    # random weight + bias vector and minibatch indices
+    rng = np.random.default_rng(7)
+    wb = rng.standard_normal(n_features + 1)
+    idx = rng.permutation(n_samples)[:400]
+    # objective values should be pretty close
+    np.testing.assert_allclose(
+        models._svc_obj_numba(wb, X_train, y_train, 0.5, np.empty(n_samples)),
+        models._svc_obj_numpy(wb, X_train, y_train, 0.5, np.empty(n_samples))
+    )
+    # gradient values should be pretty close. inputs are label-scaled
+    yX_train = y_train[:, None] * X_train
+    np.testing.assert_allclose(
+        models._svc_grad_numba(
+            wb, yX_train, y_train, idx, 0.5, np.empty(n_features + 1)
+        ),
+        models._svc_grad_numpy(
+            wb, yX_train, y_train, idx, 0.5, np.empty(n_features + 1)
+        )
+    )
+
+
 def test_fit_sanity(linsvm):
     """Test the sanity of the :class:`PrimalLinearSVC` fit method.
 
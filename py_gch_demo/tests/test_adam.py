@@ -1,14 +1,57 @@
 __doc__ = "Unit tests for the Adam implementation in ``py_gch_demo``."
 
+import warnings
+
 import numpy as np
 import pytest
 
+from . import _ridge
 # pylint: disable=no-name-in-module
 from ..solvers import adam_optimizer
 
 
+# invalid keyword arguments for adam_optimizer. each case is the keyword, the
+# bad value, the expected exception type, and a pattern expected to match the
+# exception message (None to not check the message)
+ADAM_BAD_KWARGS = [
+    # max_iter must be an int and must be positive
+    ("max_iter", "oof", TypeError, None),
+    ("max_iter", 0, ValueError, "max_iter must be positive"),
+    # alpha must be float and must be positive
+    ("alpha", "oowee", TypeError, None),
+    ("alpha", 0, ValueError, "alpha must be positive"),
+    # eps must be float and must be positive
+    ("eps", "wahh", TypeError, None),
+    ("eps", 0, ValueError, "eps must be positive"),
+    # n_iter_no_change must be int and nonnegative
+    ("n_iter_no_change", dict(), TypeError, None),
+    (
+        "n_iter_no_change", -1, ValueError,
+        "n_iter_no_change must be nonnegative"
+    ),
+    # beta_1 must be float and within [0, 1)
+    ("beta_1", (), TypeError, None),
+    ("beta_1", 1, ValueError, r"beta_1 must be inside \[0, 1\)"),
+    # beta_2 must be float and within [0, 1)
+    ("beta_2", (), TypeError, None),
+    ("beta_2", 1, ValueError, r"beta_2 must be inside \[0, 1\)")
+]
+
+# ridge objective and gradient kernels in _ridge.py, with the module required
+# by each (None if none). the loop kernels are also run uncompiled
+RIDGE_KERNELS = [
+    ("numpy", None),
+    ("blas", "scipy"),
+    ("loop", None),
+    ("numba", "numba")
+]
+
+
 def test_adam_optimizer_sanity(adam_ridge_args, adam_dummy_args):
-    """Sanity check for ``adam_optimizer`` inputs.
+    """Sanity check for ``adam_optimizer`` positional inputs.
+
+    Checks for keyword arguments are in
+    :func:`test_adam_optimizer_kwargs_sanity`.
 
     :param adam_ridge_args: ``pytest`` fixture. See package ``conftest.py``.
     :type adam_ridge_args: tuple
@@ -30,38 +73,112 @@ def test_adam_optimizer_sanity(adam_ridge_args, adam_dummy_args):
     # TypeError raised if casting is unsafe
     with pytest.raises(TypeError):
         adam_optimizer(obj, grad, np.array([1, 2, 3, 4], dtype = np.float128))
-    # max_iter must be an int and must be positive
-    with pytest.raises(TypeError):
-        adam_optimizer(*adam_ridge_args, max_iter = "oof")
-    with pytest.raises(ValueError, match = "max_iter must be positive"):
-        adam_optimizer(*adam_ridge_args, max_iter = 0)
-    # alpha must be float and must be positive
-    with pytest.raises(TypeError):
-        adam_optimizer(*adam_ridge_args, alpha = "oowee")
-    with pytest.raises(ValueError, match = "alpha must be positive"):
-        adam_optimizer(*adam_ridge_args, alpha = 0)
-    # eps must be float and must be positive
-    with pytest.raises(TypeError):
-        adam_optimizer(*adam_ridge_args, eps = "wahh")
-    with pytest.raises(ValueError, match = "eps must be positive"):
-        adam_optimizer(*adam_ridge_args, eps = 0)
-    # n_iter_no_change must be int and nonnegative
-    with pytest.raises(TypeError):
-        adam_optimizer(*adam_ridge_args, n_iter_no_change = dict())
-    with pytest.raises(
-        ValueError, match = "n_iter_no_change must be nonnegative"
-    ):
-        adam_optimizer(*adam_ridge_args, n_iter_no_change = -1)
-    # warning should be raised if eps is too large
-    with pytest.warns(UserWarning, match = "eps exceeds 1e-1"):
+    # warning should be raised if eps is too large. warnings are recorded
+    # directly instead of using pytest.warns, which does more bookkeeping
+    with warnings.catch_warnings(record = True) as caught:
+        warnings.simplefilter("always")
         print(adam_optimizer(*adam_dummy_args, eps = 1))
-    # beta_1 must be float and within [0, 1)
-    with pytest.raises(TypeError):
-        adam_optimizer(*adam_ridge_args, beta_1 = ())
-    with pytest.raises(ValueError, match = r"beta_1 must be inside \[0, 1\)"):
-        adam_optimizer(*adam_ridge_args, beta_1 = 1)
-    # beta_2 must be float and within [0, 1)
-    with pytest.raises(TypeError):
-        adam_optimizer(*adam_ridge_args, beta_2 = ())
-    with pytest.raises(ValueError, match = r"beta_2 must be inside \[0, 1\)"):
-        adam_optimizer(*adam_ridge_args, beta_2 = 1)
\ No newline at end of file
+    assert any(
+        issubclass(w.category, UserWarning) and
+        "eps exceeds 1e-1" in str(w.message) for w in caught
+    )
+
+
+@pytest.mark.parametrize("kwarg,bad_val,exc,match", ADAM_BAD_KWARGS)
+def test_adam_optimizer_kwargs_sanity(
+    adam_ridge_args, kwarg, bad_val, exc, match
+):
+    """Sanity check for ``adam_optimizer`` keyword inputs.
+
+    :param adam_ridge_args: ``pytest`` fixture. See package ``conftest.py``.
+    :type adam_ridge_args: tuple
+    :param kwarg: Name of the keyword argument
+    :type kwarg: str
+    :param bad_val: Bad value to pass for the keyword argument
+    :type bad_val: object
+    :param exc: Expected exception type
+    :type exc: type
+    :param match: Pattern expected to match the exception message, if any
+    :type match: str
+    """
+    with pytest.raises(exc, match = match):
+        adam_optimizer(*adam_ridge_args, **{kwarg: bad_val})
+
+
+def test_adam_optimizer_grad_copy(adam_dummy_args):
+    """Check that the result gradient is not the array ``grad`` returned.
+
+    Gradient functions may return a buffer they overwrite on each call, as
+    :class:`~py_gch_demo.models.PrimalLinearSVC` does, so the gradient in the
+    returned result must be a copy.
+
+    :param adam_dummy_args: ``pytest`` fixture. See package ``conftest.py``.
+    :type adam_dummy_args: tuple
+    """
+    obj, _, x0 = adam_dummy_args
+    # gradient buffer returned on every call
+    grad_buf = np.zeros_like(x0)
+    res = adam_optimizer(obj, lambda x: grad_buf, x0, max_iter = 2)
+    assert res.grad is not grad_buf
+    # overwriting the buffer shouldn't change the result
+    grad_buf[:] = 1
+    np.testing.assert_array_equal(res.grad, np.zeros_like(x0))
+
+
+def test_ridge_grad_sanity(adam_ridge_args):
+    """Check that the ridge gradient rejects data its index pool can't serve.
+
+    :param adam_ridge_args: ``pytest`` fixture. See package ``conftest.py``.
+    :type adam_ridge_args: tuple
+    """
+    _, grad, x0, (X, y), kwargs = adam_ridge_args
+    # batch_frac larger than the fraction the pool was drawn for
+    with pytest.raises(ValueError, match = "batch_frac cannot exceed"):
+        grad(x0, X, y, kwargs["reg_lambda"], 2 * kwargs["batch_frac"])
+    # data of a different size than the training data
+    with pytest.raises(ValueError, match = "y_ must have size"):
+        grad(x0, X[:-1], y[:-1], **kwargs)
+
+
+@pytest.mark.parametrize("impl,requires", RIDGE_KERNELS)
+def test_ridge_kernels(adam_ridge_args, impl, requires):
+    """Test that the ridge objective and gradient kernels match a reference.
+
+    Skipped if the module required by the kernels is not installed.
+
+    :param adam_ridge_args: ``pytest`` fixture. See package ``conftest.py``.
+    :type adam_ridge_args: tuple
+    :param impl: Suffix of the kernel names in ``_ridge.py``
+    :type impl: str
+    :param requires: Module required by the kernels, if any
+    :type requires: str
+    """
+    if requires is not None:
+        pytest.importorskip(requires)
+    obj = getattr(_ridge, f"_ridge_obj_{impl}")
+    grad = getattr(_ridge, f"_ridge_grad_{impl}")
+    # if installed, the numba kernels are the ones adam_ridge_args uses
+    if impl == "numba":
+        assert _ridge._ridge_obj is obj and _ridge._ridge_grad is grad
+    _, _, x0, (X, y), kwargs = adam_ridge_args
+    reg_lambda = kwargs["reg_lambda"]
+    # weights, bias, and minibatch indices
+    w, b = x0[:-1], x0[-1]
+    idx = np.random.default_rng(7).choice(
+        y.size, size = int(kwargs["batch_frac"] * y.size)
+    ).astype(np.int32)
+    # objective values should be pretty close
+    np.testing.assert_allclose(
+        obj(x0, X, y, reg_lambda),
+        np.power(y - X @ w - b, 2).sum() + reg_lambda * np.power(w, 2).sum()
+    )
+    # gradient values should be pretty close
+    X_batch, y_batch = X[idx], y[idx]
+    pred_diff = y_batch - X_batch @ w - b
+    np.testing.assert_allclose(
+        grad(x0, X, y, idx, reg_lambda, np.empty(x0.size)),
+        np.append(
+            -2 * (X_batch.T @ pred_diff) + 2 * reg_lambda * w,
+            -2 * pred_diff.sum()
+        )
+    )
@@ -0,0 +1,63 @@
+__doc__ = "Unit tests for :mod:`py_gch_demo.data`."
+
+import numpy as np
+import pytest
+
+from ..data import make_linear_regression, make_linear_binary_classification
+
+
+@pytest.mark.parametrize(
+    "feature_cov,match",
+    [
+        # not symmetric, though the lower triangle is positive definite
+        (np.array([[1., 5.], [0., 1.]]), "feature_cov must be symmetric"),
+        # symmetric but not positive definite
+        (np.array([[1., 2.], [2., 1.]]), "feature_cov must be positive"),
+        (-1., "feature_cov must be positive")
+    ]
+)
+def test_make_linear_regression_bad_cov(feature_cov, match):
+    """Test that :func:`make_linear_regression` rejects bad covariances.
+
+    :param feature_cov: Invalid input feature covariance
+    :type feature_cov: float or :class:`numpy.ndarray`
+    :param match: Pattern expected to match the exception message
+    :type match: str
+    """
+    with pytest.raises(ValueError, match = match):
+        make_linear_regression(n_features = 2, feature_cov = feature_cov)
+
+
+def test_make_linear_regression_identity_cov():
+    """Test that ``feature_cov = None`` is the same as the identity matrix.
+
+    With no covariance the inputs skip the Cholesky transform, which should
+    give the same data as passing the identity matrix explicitly.
+    """
+    data = make_linear_regression(rng = 7)
+    data_eye = make_linear_regression(feature_cov = np.eye(10), rng = 7)
+    for arr, arr_eye in zip(data, data_eye):
+        np.testing.assert_allclose(arr, arr_eye)
+    # check shapes of the splits
+    X_train, X_test, y_train, y_test = data
+    assert X_train.shape == (800, 10) and X_test.shape == (200, 10)
+    assert y_train.shape == (800,) and y_test.shape == (200,)
+
+
+@pytest.mark.parametrize(
+    "label_type,labels", [("0-1", [0, 1]), ("+/-1", [-1, 1])]
+)
+def test_make_linear_binary_classification_labels(label_type, labels):
+    """Test the values and dtype of the binary classification labels.
+
+    :param label_type: Type of binary labels to generate
+    :type label_type: str
+    :param labels: Expected sorted label values
+    :type labels: list
+    """
+    _, _, y_train, y_test = make_linear_binary_classification(
+        label_type = label_type, rng = 7
+    )
+    for y in (y_train, y_test):
+        assert y.dtype == np.int8
+        np.testing.assert_array_equal(np.unique(y), labels)
@@ -1,6 +1,9 @@
 # setup.py for building py_gch_examples package. extension modules can't be
 # built without setup.py so we can't use the new PEP 517 format.
 
+import os
+import platform
+
 from numpy import get_include
 from setuptools import Extension, setup
 
@@ -12,6 +15,30 @@ _PROJECT_URL = "https://github.com/phetdam/py_gch"
 _EXT_NAME = "solvers"
 
 
+def _ext_build_args():
+    """Returns extra compile and link args for the C extension module.
+
+    By default the extension is optimized for the build machine, with
+    autovectorization for its SIMD instruction set and fast floating-point
+    math. Set the environment variable ``PY_GCH_PORTABLE=1`` to only use
+    ``-O2`` (``/O2`` for MSVC), e.g. when building wheels for distribution.
+
+    :returns: 2-tuple of ``extra_compile_args``, ``extra_link_args`` lists
+    :rtype: tuple
+    """
+    msvc = platform.system() == "Windows"
+    if os.environ.get("PY_GCH_PORTABLE") == "1":
+        return (["/O2"] if msvc else ["-O2"]), []
+    if msvc:
+        return ["/O2", "/arch:AVX2", "/fp:fast", "/GL"], ["/LTCG"]
+    # -ffast-math is not passed when linking, else gcc may link crtfastmath.o,
+    # which changes floating-point behavior for the whole Python process
+    return (
+        ["-O3", "-march=native", "-ffast-math", "-funroll-loops", "-flto"],
+        ["-flto"]
+    )
+
+
 def _setup():
     # get version
     with open("VERSION", "r") as vf:
@@ -23,6 +50,8 @@ def _setup():
     )
     with open("pkg_longdesc.rst", "r") as rf:
         long_desc = rf.read()
+    # extra compile and link args for the extension module
+    compile_args, link_args = _ext_build_args()
     # perform setup
     setup(
         name = _PACKAGE_NAME,
@@ -45,6 +74,8 @@ def _setup():
         python_requires = ">=3.6",
         packages = [_PACKAGE_NAME, _PACKAGE_NAME + ".tests"],
         install_requires = ["numpy>=1.19"],
+        # numba is optional and used to compile PrimalLinearSVC kernels
+        extras_require = {"numba": ["numba>=0.50"]},
         # no extra package name for the extension module
         ext_package = _PACKAGE_NAME,
         ext_modules = [
@@ -55,6 +86,8 @@ def _setup():
                 sources = [
                     _PACKAGE_NAME + "/" + _EXT_NAME + ".c"
                 ],
+                extra_compile_args = compile_args,
+                extra_link_args = link_args
             )
         ]
     )